@@ -1,10 +1,13 @@
 from .callback import *
 from .deep_link import *
+from .i18n import *
 from .inline_keyboard import *
 from .layouts import *
+from .pagination import *
 
 __all__ = (
     "KB",
+    "KeyboardBuilder",
     "B",
     "FilterableStr",
     "OpenURL",
@@ -12,9 +15,33 @@ __all__ = (
     "ShareText",
     "CallbackData",
     "DeepLink",
+    "generate_links",
+    "write_links",
     "LayoutContext",
     "LayoutFSMContext",
     "LayoutDP",
     "LayoutMiddleware",
+    "LayoutDataSerializer",
+    "LayoutScheduler",
+    "LayoutExecutor",
+    "LayoutExecutorStats",
     "TextLayoutData",
+    "MediaLayoutData",
+    "PhotoLayoutData",
+    "DocumentLayoutData",
+    "AnimationLayoutData",
+    "MediaGroupLayoutData",
+    "FileIdStorage",
+    "MemoryFileIdStorage",
+    "Paginator",
+    "OffsetPaginator",
+    "Page",
+    "PageCD",
+    "BT",
+    "LayoutTemplate",
+    "LayoutTemplates",
+    "Plural",
+    "DictTranslations",
+    "GettextTranslations",
+    "Translations",
 )
@@ -1 +1,8 @@
+from .bulk import generate_links, write_links
 from .deep_link import DeepLink
+
+__all__ = (
+    "DeepLink",
+    "generate_links",
+    "write_links",
+)
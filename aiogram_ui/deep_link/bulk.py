@@ -0,0 +1,143 @@
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import (
+    IO,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Deque,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
+
+from aiogram import Bot
+
+from .deep_link import DeepLink
+
+Rows = Union[Iterable[Sequence[Any]], AsyncIterable[Sequence[Any]]]
+
+
+def _encode_chunk(
+    deep_link: Type[DeepLink], bot_username: str, rows: List[Sequence[Any]]
+) -> List[str]:
+    return list(deep_link.get_links(rows, bot_username))
+
+
+async def _iter_chunks(rows: Rows, chunk_size: int) -> AsyncIterator[List[Sequence[Any]]]:
+    chunk: List[Sequence[Any]] = []
+    if isinstance(rows, AsyncIterable):
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    else:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+                # Let other tasks run between chunks of long sync iterables
+                await asyncio.sleep(0)
+    if chunk:
+        yield chunk
+
+
+async def _resolve_username(bot: Optional[Bot], bot_username: Optional[str]) -> str:
+    if bot_username is not None:
+        return bot_username
+    if bot is None:
+        raise ValueError("bot or bot_username should be passed")
+    me = await bot.me()
+    if not me.username:
+        raise ValueError("Bot has no username")
+    return me.username
+
+
+async def generate_links(
+    deep_link: Type[DeepLink],
+    rows: Rows,
+    bot: Optional[Bot] = None,
+    bot_username: Optional[str] = None,
+    chunk_size: int = 10_000,
+    processes: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[str]:
+    """
+    Streams links for many deep links of one class, keeping input order
+
+    :param deep_link: DeepLink subclass
+    :param rows: iterable or async iterable of tuples of field values
+    :param bot: bot to resolve username (resolved once)
+    :param bot_username: username of bot, if passed bot is not used
+    :param chunk_size: amount of rows encoded at once
+    :param processes: if passed, chunks are encoded in process pool of this size
+        (deep link class should be importable by worker processes)
+    :param executor: executor to encode chunks in, overrides :code:`processes`
+    :return: async iterator of links
+    """
+    username = await _resolve_username(bot, bot_username)
+
+    own_executor = None
+    if executor is None and processes:
+        executor = own_executor = ProcessPoolExecutor(processes)
+
+    try:
+        if executor is None:
+            async for chunk in _iter_chunks(rows, chunk_size):
+                for link in deep_link.get_links(chunk, username):
+                    yield link
+            return
+
+        loop = asyncio.get_running_loop()
+        max_pending = 2 * (processes or os.cpu_count() or 1)
+        pending: Deque["asyncio.Future[List[str]]"] = deque()
+        async for chunk in _iter_chunks(rows, chunk_size):
+            pending.append(
+                loop.run_in_executor(executor, _encode_chunk, deep_link, username, chunk)
+            )
+            if len(pending) >= max_pending:
+                for link in await pending.popleft():
+                    yield link
+        while pending:
+            for link in await pending.popleft():
+                yield link
+    finally:
+        if own_executor is not None:
+            own_executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def write_links(
+    file: Union[str, IO[str]],
+    deep_link: Type[DeepLink],
+    rows: Rows,
+    **kwargs: Any,
+) -> int:
+    """
+    Writes links generated by :code:`generate_links` to file, one per line
+
+    :param file: path or opened text file
+    :return: amount of written links
+    """
+    if isinstance(file, str):
+        with open(file, "w") as f:
+            return await write_links(f, deep_link, rows, **kwargs)
+
+    count = 0
+    buffer: List[str] = []
+    async for link in generate_links(deep_link, rows, **kwargs):
+        buffer.append(link)
+        if len(buffer) >= 10_000:
+            file.write("\n".join(buffer) + "\n")
+            count += len(buffer)
+            buffer.clear()
+    if buffer:
+        file.write("\n".join(buffer) + "\n")
+        count += len(buffer)
+    return count
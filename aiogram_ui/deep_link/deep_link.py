@@ -1,7 +1,20 @@
 from decimal import Decimal
 from enum import Enum
 from fractions import Fraction
-from typing import TYPE_CHECKING, Any, ClassVar, Dict, Optional, Type, TypeVar, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
 from uuid import UUID
 
 from aiogram import Bot
@@ -10,11 +23,14 @@ from aiogram.types import Message
 from aiogram.utils.deep_linking import decode_payload, encode_payload
 from aiogram.utils.magic_filter import MagicFilter
 from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
 
 T = TypeVar("T", bound="DeepLink")
 
 MAX_PAYLOAD_LENGTH = 64
 
+_JSON_NATIVE = (type(None), bool, int, float, str)
+
 
 class DeepLink(BaseModel):
     """
@@ -126,6 +142,66 @@ class DeepLink(BaseModel):
     def get_link(self, bot_username: str):
         return f"https://t.me/{bot_username}?start={self.encode()}"
 
+    @classmethod
+    def compile_encoder(cls) -> Callable[[Sequence[Any]], str]:
+        """
+        Returns function that encodes tuple of field values the same way as :code:`encode`
+        but without creating and validating model instance.
+
+        Values should already have types of fields. Encoder is compiled once per class.
+        """
+        encoder = cls.__dict__.get("__encoder__")
+        if encoder is not None:
+            return encoder
+
+        names = tuple(cls.model_fields)
+        encode_value = cls.model_construct()._encode_value
+        separator = cls.__separator__
+        head = [cls.__prefix__] if cls.__prefix__ else []
+        is_plain = cls.__is_plain__
+
+        def encoder(values: Sequence[Any]) -> str:
+            if len(values) != len(names):
+                raise TypeError(
+                    f"Deep link {cls.__name__!r} takes {len(names)} arguments "
+                    f"but {len(values)} were given"
+                )
+            result = head.copy()
+            for key, value in zip(names, values):
+                if not isinstance(value, _JSON_NATIVE):
+                    value = to_jsonable_python(value)
+                encoded = encode_value(key, value)
+                if separator in encoded:
+                    raise ValueError(
+                        f"Separator symbol {separator!r} can not be used "
+                        f"in value {key}={encoded!r}"
+                    )
+                result.append(encoded)
+
+            payload = separator.join(result)
+            if is_plain:
+                return payload
+            return encode_payload(payload)
+
+        cls.__encoder__ = encoder
+        return encoder
+
+    @classmethod
+    def get_links(
+        cls, rows: Iterable[Sequence[Any]], bot_username: str
+    ) -> Iterator[str]:
+        """
+        Lazily generates links for many deep links at once
+
+        :param rows: tuples of field values in order of fields declaration
+        :param bot_username: username of bot
+        :return: iterator of links
+        """
+        encoder = cls.compile_encoder()
+        base = f"https://t.me/{bot_username}?start="
+        for row in rows:
+            yield base + encoder(row)
+
     @classmethod
     def decode(cls, payload: str):
         if cls.__is_plain__:
@@ -0,0 +1,12 @@
+from .templates import BT, LayoutTemplate, LayoutTemplates, Plural
+from .translations import DictTranslations, GettextTranslations, Translations
+
+__all__ = (
+    "BT",
+    "LayoutTemplate",
+    "LayoutTemplates",
+    "Plural",
+    "DictTranslations",
+    "GettextTranslations",
+    "Translations",
+)
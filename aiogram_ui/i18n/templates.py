@@ -0,0 +1,265 @@
+from string import Formatter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from aiogram.filters.callback_data import CallbackData
+
+from ..inline_keyboard import IKB, IKM, B, KeyboardBuilder
+from ..inline_keyboard.b_action import BAction
+from ..layouts import TextLayoutData
+from .translations import PluralFunc, Translations
+
+Action = Union[str, CallbackData, BAction]
+ActionFactory = Callable[[Dict[str, Any]], Action]
+
+_formatter = Formatter()
+
+
+class CompiledFormat:
+    """
+    Format string parsed once
+
+    Fields with plain names are filled directly, other fields
+    (:code:`{user.name}`, :code:`{items[0]}`) fall back to :code:`str.format`.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self._parts: List[Tuple[str, Optional[str], str, Optional[str]]] = list(
+            _formatter.parse(template)
+        )
+        self.fields = {i[1] for i in self._parts if i[1] is not None}
+        self.is_static = not self.fields and "{" not in template and "}" not in template
+        # Nested fields in format spec ("{price:.{digits}f}") need str.format
+        self._simple = all(
+            i.isidentifier() and not i.startswith("_") for i in self.fields
+        ) and not any(spec and "{" in spec for _, _, spec, _ in self._parts)
+
+    def format(self, variables: Dict[str, Any]) -> str:
+        if self.is_static:
+            return self.template
+        if not self._simple:
+            return self.template.format(**variables)
+
+        result = []
+        for literal, field, spec, conversion in self._parts:
+            result.append(literal)
+            if field is None:
+                continue
+            value = variables[field]
+            if conversion:
+                value = _formatter.convert_field(value, conversion)
+            result.append(format(value, spec) if spec else str(value))
+        return "".join(result)
+
+
+class Plural:
+    """
+    Text with plural forms, form is chosen by variable :code:`n`
+    """
+
+    def __init__(self, singular: str, plural: str, n: str = "n"):
+        self.singular = singular
+        self.plural = plural
+        self.n = n
+
+
+class CompiledText:
+    def __init__(
+        self, forms: List[CompiledFormat], plural: Optional[PluralFunc], n: str
+    ):
+        self._forms = forms
+        self._plural = plural
+        self._n = n
+        self.is_static = plural is None and forms[0].is_static
+
+    def format(self, variables: Dict[str, Any]) -> str:
+        if self._plural is None:
+            return self._forms[0].format(variables)
+        index = self._plural(variables[self._n])
+        return self._forms[min(index, len(self._forms) - 1)].format(variables)
+
+
+def _compile_text(
+    text: Union[str, Plural], translations: Translations, locale: str
+) -> CompiledText:
+    if isinstance(text, Plural):
+        forms, plural = translations.plural_forms(locale, text.singular, text.plural)
+        return CompiledText([CompiledFormat(i) for i in forms], plural, text.n)
+    return CompiledText([CompiledFormat(translations.gettext(locale, text))], None, "")
+
+
+class BT:
+    """
+    Button template
+
+    :code:`text` is translated, :code:`action` can be a string
+    (format string of variables is allowed), CallbackData, BAction or a function of
+    variables dict returning one of them.
+    :code:`show` can be a bool or a name of variable.
+    """
+
+    def __init__(
+        self,
+        text: Union[str, Plural],
+        action: Union[Action, ActionFactory],
+        show: Union[bool, str] = True,
+    ):
+        self.text = text
+        self.action = action
+        self.show = show
+
+
+class CompiledButton:
+    def __init__(self, template: BT, translations: Translations, locale: str):
+        self._text = _compile_text(template.text, translations, locale)
+        self._action = template.action
+        self._action_format = (
+            CompiledFormat(template.action) if isinstance(template.action, str) else None
+        )
+        self._show = template.show
+        self.is_static = (
+            isinstance(self._show, bool)
+            and self._text.is_static
+            and not callable(self._action)
+            and (self._action_format is None or self._action_format.is_static)
+        )
+        self._button: Optional[IKB] = None
+        if self.is_static:
+            self._button = B(self._text.format({}), self._action, self._show)
+
+    def render(self, variables: Dict[str, Any]) -> Optional[IKB]:
+        if self.is_static:
+            return self._button
+
+        show = self._show if isinstance(self._show, bool) else bool(variables[self._show])
+        if not show:
+            return None
+
+        action: Action
+        if self._action_format is not None:
+            action = self._action_format.format(variables)
+        elif callable(self._action):
+            action = self._action(variables)
+        else:
+            action = self._action
+        return B(self._text.format(variables), action)
+
+
+Row = Union[BT, Sequence[BT]]
+
+
+class LayoutTemplate:
+    """
+    Template of TextLayoutData
+
+    :code:`keyboard` elements are buttons (one per row) or sequences of buttons (row).
+    Other keyword arguments (parse_mode, etc.) are passed to TextLayoutData.
+    """
+
+    def __init__(
+        self,
+        text: Union[str, Plural],
+        keyboard: Sequence[Row] = (),
+        **layout_kwargs: Any,
+    ):
+        self.text = text
+        self.keyboard = keyboard
+        self.layout_kwargs = layout_kwargs
+
+    def compile(self, translations: Translations, locale: str) -> "CompiledLayout":
+        return CompiledLayout(self, translations, locale)
+
+
+class CompiledLayout:
+    """
+    LayoutTemplate compiled for one locale
+
+    Keyboard without variable buttons is built only once, every render gets
+    its own markup with the same (immutable) buttons.
+    """
+
+    def __init__(self, template: LayoutTemplate, translations: Translations, locale: str):
+        self.locale = locale
+        self._text = _compile_text(template.text, translations, locale)
+        self._layout_kwargs = template.layout_kwargs
+        self._rows: List[List[CompiledButton]] = [
+            [CompiledButton(i, translations, locale)]
+            if isinstance(i, BT)
+            else [CompiledButton(j, translations, locale) for j in i]
+            for i in template.keyboard
+        ]
+        self._static_rows: Optional[Tuple[Tuple[IKB, ...], ...]] = None
+        if self._rows and all(b.is_static for row in self._rows for b in row):
+            self._static_rows = tuple(
+                tuple(row) for row in self._build_keyboard({}).inline_keyboard
+            )
+
+    def _build_keyboard(self, variables: Dict[str, Any]) -> IKM:
+        builder = KeyboardBuilder()
+        for row in self._rows:
+            builder.append([b.render(variables) for b in row])
+        return builder.build()
+
+    def render(self, **variables: Any) -> TextLayoutData:
+        keyboard = None
+        if self._static_rows is not None:
+            keyboard = IKM(inline_keyboard=[list(row) for row in self._static_rows])
+        elif self._rows:
+            keyboard = self._build_keyboard(variables)
+        return TextLayoutData(
+            text=self._text.format(variables),
+            reply_markup=keyboard,
+            **self._layout_kwargs,
+        )
+
+
+class LayoutTemplates:
+    """
+    Registry of layout templates compiled per locale
+
+    Locales are compiled on first render or by :code:`compile`
+    (e.g. at startup), :code:`reload` rebuilds only one locale.
+    If a template is added or changed, compiled locales are dropped.
+    """
+
+    def __init__(self, translations: Translations, default_locale: str = "en"):
+        self.translations = translations
+        self.default_locale = default_locale
+        self._templates: Dict[str, LayoutTemplate] = {}
+        self._compiled: Dict[str, Dict[str, CompiledLayout]] = {}
+
+    def add(self, name: str, template: LayoutTemplate) -> LayoutTemplate:
+        self._templates[name] = template
+        self._compiled.clear()
+        return template
+
+    def compile(self, *locales: str) -> None:
+        for locale in locales or (self.default_locale,):
+            self._compiled[locale] = {
+                name: template.compile(self.translations, locale)
+                for name, template in self._templates.items()
+            }
+
+    def reload(self, locale: str) -> None:
+        """Reloads translations of locale and compiles its templates again"""
+        self.translations.reload(locale)
+        self.compile(locale)
+
+    @property
+    def locales(self) -> List[str]:
+        return list(self._compiled)
+
+    def get(self, name: str, locale: Optional[str] = None) -> CompiledLayout:
+        locale = locale or self.default_locale
+        compiled = self._compiled.get(locale)
+        if compiled is None:
+            self.compile(locale)
+            compiled = self._compiled[locale]
+        if name not in compiled:
+            raise ValueError(f"Template {name} not found")
+        return compiled[name]
+
+    def render(
+        self, name: str, locale: Optional[str] = None, /, **variables: Any
+    ) -> TextLayoutData:
+        return self.get(name, locale).render(**variables)
@@ -0,0 +1,103 @@
+import gettext
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+PluralFunc = Callable[[int], int]
+
+
+def default_plural(n: int) -> int:
+    return int(n != 1)
+
+
+class Translations(ABC):
+    """A class that represents a source of translated strings. It is an abstract class."""
+
+    @abstractmethod
+    def gettext(self, locale: str, message: str) -> str:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def plural_forms(
+        self, locale: str, singular: str, plural: str
+    ) -> Tuple[List[str], PluralFunc]:
+        """
+        Returns all plural forms of message for locale and function
+        that returns index of form for number
+        """
+        raise NotImplementedError()
+
+    def reload(self, locale: str) -> None:
+        """Reloads translations of locale from its source"""
+
+
+class DictTranslations(Translations):
+    """
+    Translations from dict :code:`{locale: {message: translation}}`
+
+    Plural translation is a list of forms, stored under singular message.
+    :code:`plural_rules` maps locale to function returning index of form for number.
+    """
+
+    def __init__(
+        self,
+        translations: Mapping[str, Mapping[str, Union[str, Sequence[str]]]],
+        plural_rules: Optional[Mapping[str, PluralFunc]] = None,
+    ):
+        self.translations = translations
+        self.plural_rules = plural_rules or {}
+
+    def gettext(self, locale: str, message: str) -> str:
+        translation = self.translations.get(locale, {}).get(message, message)
+        if isinstance(translation, str):
+            return translation
+        return translation[0]
+
+    def plural_forms(
+        self, locale: str, singular: str, plural: str
+    ) -> Tuple[List[str], PluralFunc]:
+        translation = self.translations.get(locale, {}).get(singular)
+        if translation is None or isinstance(translation, str):
+            return [singular, plural], default_plural
+        return list(translation), self.plural_rules.get(locale, default_plural)
+
+
+class GettextTranslations(Translations):
+    """
+    Translations from compiled gettext catalogs: :code:`<localedir>/<locale>/LC_MESSAGES/<domain>.mo`
+    """
+
+    def __init__(self, localedir: str, domain: str = "messages"):
+        self.localedir = localedir
+        self.domain = domain
+        self._catalogs: Dict[str, gettext.NullTranslations] = {}
+
+    def _get(self, locale: str) -> gettext.NullTranslations:
+        if locale not in self._catalogs:
+            path = gettext.find(self.domain, self.localedir, languages=[locale])
+            if path is None:
+                self._catalogs[locale] = gettext.NullTranslations()
+            else:
+                # Not gettext.translation, it caches catalogs forever
+                with open(path, "rb") as f:
+                    self._catalogs[locale] = gettext.GNUTranslations(f)
+        return self._catalogs[locale]
+
+    def gettext(self, locale: str, message: str) -> str:
+        return self._get(locale).gettext(message)
+
+    def plural_forms(
+        self, locale: str, singular: str, plural: str
+    ) -> Tuple[List[str], PluralFunc]:
+        catalog = self._get(locale)
+        if not isinstance(catalog, gettext.GNUTranslations):
+            return [singular, plural], default_plural
+
+        forms: List[str] = []
+        while (singular, len(forms)) in catalog._catalog:  # type: ignore[attr-defined]
+            forms.append(catalog._catalog[(singular, len(forms))])  # type: ignore[attr-defined]
+        if not forms:
+            return [singular, plural], default_plural
+        return forms, catalog.plural  # type: ignore[attr-defined]
+
+    def reload(self, locale: str) -> None:
+        self._catalogs.pop(locale, None)
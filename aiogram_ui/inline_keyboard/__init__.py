@@ -2,6 +2,7 @@ __all__ = (
     "IKB",
     "IKM",
     "KB",
+    "KeyboardBuilder",
     "B",
     "OpenURL",
     "OpenWebApp",
@@ -10,4 +11,4 @@ __all__ = (
 
 from .b_action import *
 from .ikb import IKB, B
-from .ikm import IKM, KB
+from .ikm import IKM, KB, KeyboardBuilder
@@ -1,4 +1,4 @@
-from typing import Iterable, Optional, Sequence, Union
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
@@ -20,11 +20,8 @@ class IKM(InlineKeyboardMarkup):
         Raises:
             ValueError: If the 'other' object is not an instance of IKB, IKM, or InlineKeyboardMarkup.
         """
-        if isinstance(other, IKB):
-            return IKM(inline_keyboard=self.inline_keyboard + [[other]])
-
-        if isinstance(other, InlineKeyboardMarkup):
-            return IKM(inline_keyboard=self.inline_keyboard + other.inline_keyboard)
+        if isinstance(other, (IKB, InlineKeyboardMarkup)):
+            return KeyboardBuilder(self).append(other).build()
 
         raise ValueError("Other should be IKB, IKM or InlineKeyboardMarkup")
 
@@ -46,13 +43,179 @@ class IKM(InlineKeyboardMarkup):
                 f"Line number should be less then lines amount({len(self.inline_keyboard)})!"
             )
 
-        return IKM(
-            inline_keyboard=[
-                self.inline_keyboard[i]
-                for i in range(len(self.inline_keyboard))
-                if i != line_n
-            ]
-        )
+        builder = KeyboardBuilder(self)
+        if 0 <= line_n < len(builder):
+            builder.remove(line_n)
+        return builder.build()
+
+    def builder(self) -> "KeyboardBuilder":
+        """
+        Returns a KeyboardBuilder sharing the rows of this keyboard.
+        """
+        return KeyboardBuilder(self)
+
+
+Row = List[InlineKeyboardButton]
+
+
+class KeyboardBuilder:
+    """
+    A mutable keyboard builder.
+
+    Rows are shared between builders and keyboards instead of being copied,
+    so appending, concatenating and slicing cost only as much as the number of
+    rows touched. Shared rows are never changed: rows are given out as tuples
+    and builder only adds or removes whole rows.
+    The IKM is validated once, in the final build() call.
+
+    Args:
+        *keyboards: InlineKeyboardMarkup or KeyboardBuilder objects to start from.
+    """
+
+    def __init__(self, *keyboards: Union[InlineKeyboardMarkup, "KeyboardBuilder"]):
+        self._rows: List[Row] = []
+        for keyboard in keyboards:
+            self.extend(keyboard)
+
+    @staticmethod
+    def _make_row(
+        row: Union[InlineKeyboardButton, Sequence[Optional[InlineKeyboardButton]]]
+    ) -> Row:
+        if isinstance(row, InlineKeyboardButton):
+            return [row]
+
+        if isinstance(row, Sequence):
+            return [i for i in row if isinstance(i, InlineKeyboardButton)]
+
+        raise ValueError("Row should be InlineKeyboardButton or Sequence of them")
+
+    def append(
+        self,
+        row: Union[
+            InlineKeyboardButton,
+            Sequence[Optional[InlineKeyboardButton]],
+            InlineKeyboardMarkup,
+            "KeyboardBuilder",
+        ],
+    ) -> "KeyboardBuilder":
+        """
+        Appends a button (as a single-button row), a row or all rows of a keyboard.
+        Empty rows are skipped.
+        """
+        if isinstance(row, (InlineKeyboardMarkup, KeyboardBuilder)):
+            return self.extend(row)
+
+        row = self._make_row(row)
+        if row:
+            self._rows.append(row)
+        return self
+
+    def insert(
+        self,
+        index: int,
+        row: Union[InlineKeyboardButton, Sequence[Optional[InlineKeyboardButton]]],
+    ) -> "KeyboardBuilder":
+        """
+        Inserts a row before the row with the given index.
+        """
+        row = self._make_row(row)
+        if row:
+            self._rows.insert(index, row)
+        return self
+
+    def remove(self, index: int) -> Tuple[InlineKeyboardButton, ...]:
+        """
+        Removes the row with the given index and returns its buttons.
+        """
+        return tuple(self._rows.pop(index))
+
+    def extend(
+        self, other: Union[InlineKeyboardMarkup, "KeyboardBuilder"]
+    ) -> "KeyboardBuilder":
+        """
+        Appends all rows of a keyboard or a builder.
+        """
+        if isinstance(other, KeyboardBuilder):
+            self._rows += other._rows
+        elif isinstance(other, InlineKeyboardMarkup):
+            self._rows += other.inline_keyboard
+        else:
+            raise ValueError("Other should be IKM, InlineKeyboardMarkup or KeyboardBuilder")
+        return self
+
+    def add(
+        self,
+        *args: Union[
+            InlineKeyboardButton,
+            None,
+            Sequence[Optional[InlineKeyboardButton]],
+            InlineKeyboardMarkup,
+        ],
+        vertical=True,
+    ) -> "KeyboardBuilder":
+        """
+        Appends rows the same way KB() does.
+
+        Consecutive buttons become one row each if 'vertical' is True,
+        otherwise they are grouped in a single row. None values are skipped.
+        """
+        group: Row = []
+        for current in args:
+            if current is None or isinstance(current, InlineKeyboardButton):
+                if current is not None:
+                    group.append(current)
+                continue
+
+            self._add_group(group, vertical)
+            group = []
+
+            if isinstance(current, InlineKeyboardMarkup):
+                self.extend(current)
+            elif isinstance(current, Sequence):
+                self.append(current)
+
+        self._add_group(group, vertical)
+        return self
+
+    def _add_group(self, group: Row, vertical: bool):
+        if not group:
+            return
+        if vertical:
+            self._rows += [[btn] for btn in group]
+        else:
+            self._rows.append(group)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[Tuple[InlineKeyboardButton, ...]]:
+        return (tuple(row) for row in self._rows)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            builder = KeyboardBuilder()
+            builder._rows = self._rows[index]
+            return builder
+        return tuple(self._rows[index])
+
+    def __delitem__(self, index: Union[int, slice]):
+        del self._rows[index]
+
+    def __add__(
+        self, other: Union[InlineKeyboardButton, InlineKeyboardMarkup, "KeyboardBuilder"]
+    ) -> "KeyboardBuilder":
+        return KeyboardBuilder(self).append(other)
+
+    def __iadd__(
+        self, other: Union[InlineKeyboardButton, InlineKeyboardMarkup, "KeyboardBuilder"]
+    ) -> "KeyboardBuilder":
+        return self.append(other)
+
+    def build(self) -> IKM:
+        """
+        Returns a validated IKM with the current rows.
+        """
+        return IKM(inline_keyboard=self._rows)
 
 
 def KB(
@@ -72,37 +235,4 @@ def KB(
     The 'vertical' parameter is a boolean that determines the layout of the buttons.
     Returns an InlineKeyboardMarkup.
     """
-    inline_keyboard = []
-    i = 0
-    while i < len(args):
-        current = args[i]
-        # FOR LIST OF BUTTONS
-        if isinstance(current, Sequence):
-            group = []
-            for item in current:
-                if isinstance(item, InlineKeyboardButton):
-                    group.append(item)
-
-            if group:
-                inline_keyboard.append(group)
-
-        # FOR InlineKeyboardMarkup INSTANCE
-        if isinstance(current, InlineKeyboardMarkup):
-            inline_keyboard += current.inline_keyboard
-
-        # FOR SEQUENCE OF BUTTONS
-        group = []
-        while i < len(args) and (
-            isinstance(args[i], InlineKeyboardButton) or args[i] is None
-        ):
-            if args[i]:
-                group.append(args[i])
-            i += 1
-
-        if group:
-            inline_keyboard += [[btn] for btn in group] if vertical else [group]
-            i -= 1
-
-        i += 1
-
-    return IKM(inline_keyboard=inline_keyboard)
+    return KeyboardBuilder().add(*args, vertical=vertical).build()
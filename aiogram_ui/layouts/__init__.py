@@ -1,7 +1,18 @@
 from .context import LayoutContext
+from .executor import LayoutExecutor, LayoutExecutorStats
+from .file_id_storage import FileIdStorage, MemoryFileIdStorage
 from .fsm_context import LayoutFSMContext
 from .handler_dispatcher import LayoutDP
+from .media_layout_data import (
+    AnimationLayoutData,
+    DocumentLayoutData,
+    MediaGroupLayoutData,
+    MediaLayoutData,
+    PhotoLayoutData,
+)
 from .middleware import LayoutMiddleware
+from .scheduler import LayoutScheduler
+from .serializer import LayoutDataSerializer
 from .text_layout_data import TextLayoutData
 
 __all__ = (
@@ -9,5 +20,16 @@ __all__ = (
     "LayoutFSMContext",
     "LayoutDP",
     "LayoutMiddleware",
+    "LayoutDataSerializer",
+    "LayoutScheduler",
+    "LayoutExecutor",
+    "LayoutExecutorStats",
     "TextLayoutData",
+    "MediaLayoutData",
+    "PhotoLayoutData",
+    "DocumentLayoutData",
+    "AnimationLayoutData",
+    "MediaGroupLayoutData",
+    "FileIdStorage",
+    "MemoryFileIdStorage",
 )
@@ -1,13 +1,17 @@
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 from aiogram.dispatcher.event.handler import CallbackType
 from aiogram.types import CallbackQuery, Message
 
+from .media_layout_data import MediaGroupLayoutData, MediaLayoutData
 from .text_layout_data import TextLayoutData
 
 if TYPE_CHECKING:
     from .handler_dispatcher import LayoutDP
 
+LayoutData = Union[TextLayoutData, MediaLayoutData, MediaGroupLayoutData]
+LAYOUT_DATA_TYPES = (TextLayoutData, MediaLayoutData, MediaGroupLayoutData)
+
 
 class LayoutContext:
     def __init__(
@@ -23,21 +27,27 @@ class LayoutContext:
     def is_original(self):
         return len(self._events) == 1
 
-    async def set(self, layout: TextLayoutData):
-        event = await layout.set(self._events[-1])
+    def _add_event(self, event: Any):
+        # Media group is sent as list of messages
+        if isinstance(event, list) and event:
+            event = event[-1]
         if isinstance(event, Message):
             self._events.append(event)
+
+    async def set(self, layout: LayoutData):
+        event = await layout.set(self._events[-1])
+        self._add_event(event)
         return event
 
-    async def send(self, layout: TextLayoutData):
+    async def send(self, layout: LayoutData):
         event = await layout.send(self.original_event)
-        self._events.append(event)
+        self._add_event(event)
         return event
 
-    async def send_to(self, layout: TextLayoutData, chat_id: Union[int, str]):
+    async def send_to(self, layout: LayoutData, chat_id: Union[int, str]):
         assert self.original_event.bot, "event.bot must be set before using this layout"
         event = await layout.send_to(chat_id, self.original_event.bot)
-        self._events.append(event)
+        self._add_event(event)
         return event
 
     def run(
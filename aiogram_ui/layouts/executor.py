@@ -0,0 +1,153 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict
+
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import TelegramObject
+from pydantic import BaseModel
+
+CPU_BOUND = "cpu_bound"
+PROCESS = "process"
+
+MODES = (CPU_BOUND, PROCESS)
+
+# Bound to the event loop or to connections of the bot, so they can not leave the process
+PROCESS_UNSUPPORTED = frozenset({"bot", "state", "layout_context", "layout_scheduler"})
+PLAIN_TYPES = (type(None), bool, int, float, str, bytes)
+
+
+class LayoutExecutorStats:
+    """Queue depth and wait time of one executor mode"""
+
+    def __init__(self):
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.completed if self.completed else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"LayoutExecutorStats(queued={self.queued}, running={self.running}, "
+            f"completed={self.completed}, avg_wait={self.avg_wait:.4f}, "
+            f"max_wait={self.max_wait:.4f})"
+        )
+
+
+class LayoutExecutor:
+    """
+    Runs sync layout handlers marked as :code:`cpu_bound` (thread pool)
+    or :code:`process` (process pool) off the event loop
+
+    At most :code:`max_threads`/:code:`max_processes` handlers of a mode run at once,
+    others wait in queue. If :code:`max_queue` handlers are already waiting,
+    new ones are rejected with RuntimeError.
+
+    Handlers run in process pool should be importable module-level functions.
+    Only the event and plain data (str, numbers, lists, dicts, pydantic models) are
+    passed to them, events without bot bound to them. Handlers requesting
+    :code:`bot`, :code:`state`, :code:`layout_context` or :code:`layout_scheduler`
+    (or any other non-plain argument) are rejected with TypeError.
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 4,
+        max_processes: int = 2,
+        max_queue: int = 1000,
+    ):
+        self.max_queue = max_queue
+        self._workers = {CPU_BOUND: max_threads, PROCESS: max_processes}
+        self._pools: Dict[str, Executor] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.stats = {mode: LayoutExecutorStats() for mode in MODES}
+
+    def _get_pool(self, mode: str) -> Executor:
+        if mode not in self._pools:
+            if mode == CPU_BOUND:
+                self._pools[mode] = ThreadPoolExecutor(
+                    self._workers[mode], thread_name_prefix="aiogram_ui_layout"
+                )
+            else:
+                self._pools[mode] = ProcessPoolExecutor(self._workers[mode])
+        return self._pools[mode]
+
+    def _get_semaphore(self, mode: str) -> asyncio.Semaphore:
+        if mode not in self._semaphores:
+            self._semaphores[mode] = asyncio.Semaphore(self._workers[mode])
+        return self._semaphores[mode]
+
+    @classmethod
+    def _is_plain(cls, value: Any) -> bool:
+        if isinstance(value, (PLAIN_TYPES, BaseModel)):
+            return True
+        if isinstance(value, (list, tuple)):
+            return all(cls._is_plain(i) for i in value)
+        if isinstance(value, dict):
+            return all(cls._is_plain(k) and cls._is_plain(v) for k, v in value.items())
+        return False
+
+    @classmethod
+    def _to_process(cls, handler: HandlerObject, name: str, value: Any) -> Any:
+        callback_name = getattr(handler.callback, "__name__", repr(handler.callback))
+        if name in PROCESS_UNSUPPORTED or not cls._is_plain(value):
+            raise TypeError(
+                f"Handler {callback_name!r} runs in {PROCESS!r} executor "
+                f"and can not take {name!r}, only the event and plain data are passed"
+            )
+        # Bot is bound to telegram objects and can not be pickled
+        if isinstance(value, TelegramObject):
+            return value.model_validate(value.model_dump())
+        return value
+
+    async def call(
+        self, mode: str, handler: HandlerObject, *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Runs handler in executor of the mode, kwargs are filtered by handler signature
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown executor mode {mode!r}, expected one of {MODES}")
+
+        if not handler.varkw:
+            kwargs = {k: v for k, v in kwargs.items() if k in handler.params}
+        if mode == PROCESS:
+            args = tuple(self._to_process(handler, "event", i) for i in args)
+            kwargs = {k: self._to_process(handler, k, v) for k, v in kwargs.items()}
+
+        stats = self.stats[mode]
+        if stats.queued >= self.max_queue:
+            raise RuntimeError(f"Layout executor queue for {mode!r} is full")
+
+        stats.queued += 1
+        queued_at = time.monotonic()
+        try:
+            await self._get_semaphore(mode).acquire()
+        finally:
+            stats.queued -= 1
+
+        wait = time.monotonic() - queued_at
+        stats.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_pool(mode),
+                functools.partial(handler.callback, *args, **kwargs),
+            )
+        finally:
+            stats.running -= 1
+            stats.completed += 1
+            stats.total_wait += wait
+            stats.max_wait = max(stats.max_wait, wait)
+            self._get_semaphore(mode).release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait)
+        self._pools.clear()
@@ -0,0 +1,87 @@
+import asyncio
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+from aiogram.types import BufferedInputFile, FSInputFile, InputFile, URLInputFile
+from cachetools import LRUCache
+
+
+class FileIdStorage(ABC):
+    """
+    Storage of file_id of uploaded files by content hash.
+
+    file_id is valid only for the bot that uploaded the file, so it is stored per bot.
+    """
+
+    @abstractmethod
+    async def get(self, bot_id: int, key: str) -> Optional[str]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def set(self, bot_id: int, key: str, file_id: str) -> None:
+        raise NotImplementedError()
+
+
+class MemoryFileIdStorage(FileIdStorage):
+    """In-process FileIdStorage, is lost on restart"""
+
+    def __init__(self):
+        self._file_ids: Dict[Tuple[int, str], str] = {}
+
+    async def get(self, bot_id: int, key: str) -> Optional[str]:
+        return self._file_ids.get((bot_id, key))
+
+    async def set(self, bot_id: int, key: str, file_id: str) -> None:
+        self._file_ids[(bot_id, key)] = file_id
+
+
+# Path -> (size, mtime, hash) of recently sent files
+_fs_hashes: "LRUCache[str, Tuple[int, int, str]]" = LRUCache(maxsize=1024)
+
+
+def _read_hash(
+    path: str, cached: Optional[Tuple[int, int, str]]
+) -> Tuple[int, int, str]:
+    stat = os.stat(path)
+    if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return stat.st_size, stat.st_mtime_ns, digest.hexdigest()
+
+
+async def _hash_path(path: str) -> str:
+    # Files can be up to 50 MB, reading them must not block the event loop
+    entry = await asyncio.to_thread(_read_hash, path, _fs_hashes.get(path))
+    _fs_hashes[path] = entry
+    return entry[2]
+
+
+async def file_key(file: InputFile) -> Optional[str]:
+    """
+    Returns content hash based key of input file or None if it can not be computed.
+
+    Hashes are computed in a thread. Hash of BufferedInputFile is stored on the object,
+    hash of FSInputFile is recomputed only when size or modification time
+    of the file changes.
+    """
+    if isinstance(file, BufferedInputFile):
+        key = getattr(file, "_file_key", None)
+        if key is None:
+            digest = await asyncio.to_thread(hashlib.sha256, file.data)
+            key = "sha256:" + digest.hexdigest()
+            file._file_key = key  # type: ignore[attr-defined]
+        return key
+
+    if isinstance(file, FSInputFile):
+        return "sha256:" + await _hash_path(str(file.path))
+
+    if isinstance(file, URLInputFile):
+        return "url:" + file.url
+
+    return None
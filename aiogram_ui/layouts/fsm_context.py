@@ -5,8 +5,12 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.storage.base import BaseStorage, StorageKey
 from cachetools import TTLCache
 
+TIMER_LAYOUT = "layout"
+TIMER_NEXT_CALLBACK = "next_callback"
+
 if TYPE_CHECKING:
     from .handler_dispatcher import LayoutDP
+    from .scheduler import LayoutScheduler
 
 
 class LayoutFSMContext(FSMContext):
@@ -18,10 +22,18 @@ class LayoutFSMContext(FSMContext):
         storage: BaseStorage,
         key: StorageKey,
         layout_handler_dispatcher: "LayoutDP",
+        layout_scheduler: Optional["LayoutScheduler"] = None,
     ) -> None:
         self.storage = storage
         self.key = key
         self._layout_handler_dispatcher = layout_handler_dispatcher
+        self._layout_scheduler = layout_scheduler
+
+    @property
+    def layout_scheduler(self) -> "LayoutScheduler":
+        if self._layout_scheduler is None:
+            raise ValueError("LayoutScheduler is not passed to LayoutMiddleware")
+        return self._layout_scheduler
 
     def _separate_data(
         self, data: Dict[str, Any]
@@ -112,16 +124,67 @@ class LayoutFSMContext(FSMContext):
         layout_data = self._add_prefix(layout_data)
         await self._set_data(data=state_data | layout_data)
 
-    async def set_next_callback(self, callback: Union[CallbackType, str]) -> None:
+    async def set_next_callback(
+        self,
+        callback: Union[CallbackType, str],
+        timeout: Optional[float] = None,
+        on_timeout: Optional[Union[CallbackType, str]] = None,
+    ) -> None:
+        """
+        Sets next callback
+
+        If :code:`timeout` is passed, next callback expires after this amount of seconds
+        and :code:`on_timeout` handler (if passed) is called by LayoutScheduler.
+        """
         name = self._layout_handler_dispatcher.get_handler_name(callback)
-        await self.update_layout_data(next_callback=name)
+        data = await self.get_layout_data()
+        self._cancel_next_callback_timer(data)
+        data["next_callback"] = name
+        if timeout is not None:
+            data["next_callback_timer"] = self.layout_scheduler.schedule(
+                timeout,
+                TIMER_NEXT_CALLBACK,
+                chat_id=self.key.chat_id,
+                user_id=self.key.user_id,
+                handler=on_timeout,
+                thread_id=self.key.thread_id,
+            )
+        await self.set_layout_data(data)
+
+    def _cancel_next_callback_timer(self, data: Dict[str, Any]) -> None:
+        timer_id = data.pop("next_callback_timer", None)
+        if timer_id is not None and self._layout_scheduler is not None:
+            self._layout_scheduler.cancel(timer_id)
 
     async def pop_next_callback(self) -> CallbackType:
         data = await self.get_layout_data()
         next_callback_name = data.pop("next_callback", None)
         if next_callback_name:
             next_callback = self._layout_handler_dispatcher.get(next_callback_name)
+            self._cancel_next_callback_timer(data)
             await self.set_layout_data(data)
             return next_callback
 
         raise ValueError("No next callback found")
+
+    async def send_later(
+        self, handler: Union[CallbackType, str], delay: float, **data: Any
+    ) -> str:
+        """
+        Calls layout handler after :code:`delay` seconds and sends its layout to the chat
+
+        :param data: JSON serializable keyword arguments for handler
+        :return: timer id, can be passed to :code:`cancel_timer`
+        """
+        return self.layout_scheduler.schedule(
+            delay,
+            TIMER_LAYOUT,
+            chat_id=self.key.chat_id,
+            user_id=self.key.user_id,
+            handler=handler,
+            thread_id=self.key.thread_id,
+            **data,
+        )
+
+    def cancel_timer(self, timer_id: str) -> bool:
+        return self.layout_scheduler.cancel(timer_id)
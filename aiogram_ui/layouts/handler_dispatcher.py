@@ -1,33 +1,101 @@
-from typing import Dict, Optional, Union
+import inspect
+from typing import Any, Dict, List, Optional, Union
 
 from aiogram.dispatcher.event.handler import CallbackType
 
+from .executor import MODES
+from .render_cache import CacheKeyType, RenderCache
+
 
 class LayoutDP:
     def __init__(self):
         self._handlers: Dict[str, CallbackType] = {}
+        self._executor_modes: Dict[CallbackType, str] = {}
 
     def get(self, handler_name: str):
         if handler_name not in self._handlers:
             raise ValueError(f"Handler {handler_name} not found")
         return self._handlers[handler_name]
 
-    def add(self, handler: CallbackType, name: Optional[str] = None):
+    def names(self) -> List[str]:
+        return list(self._handlers)
+
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    def add(
+        self,
+        handler: CallbackType,
+        name: Optional[str] = None,
+        cache_key: Optional[CacheKeyType] = None,
+        cache_ttl: Optional[float] = None,
+        cache_size: int = 1024,
+        executor: Optional[str] = None,
+    ) -> CallbackType:
+        """
+        Registers handler
+
+        If :code:`cache_key` or :code:`cache_ttl` is passed, TextLayoutData returned by
+        handler is cached by :code:`cache_key(*handler_args)` (one entry if not passed)
+        for :code:`cache_ttl` seconds (60 by default).
+
+        If :code:`executor` is :code:`"cpu_bound"` or :code:`"process"`, sync handler is run
+        by LayoutMiddleware and LayoutScheduler in thread or process pool of LayoutExecutor.
+        Handlers run in process pool get only the event and plain data.
+
+        :return: registered handler (wrapped one if cached)
+        """
+        is_cached = cache_key is not None or cache_ttl is not None
+        if executor is not None:
+            if executor not in MODES:
+                raise ValueError(f"Unknown executor {executor!r}, expected one of {MODES}")
+            if inspect.iscoroutinefunction(handler):
+                raise ValueError("Only sync handlers can be run in executor")
+            if is_cached:
+                raise ValueError("Cached handlers can not be run in executor")
+            self._executor_modes[handler] = executor
+
+        if is_cached:
+            cache = RenderCache(cache_key, ttl=cache_ttl or 60, maxsize=cache_size)
+            handler = cache.wrap(handler)
         self._handlers[f"{name or handler.__name__}"] = handler
+        return handler
+
+    def get_executor_mode(self, handler: CallbackType) -> Optional[str]:
+        return self._executor_modes.get(handler)
 
-    def __call__(self, name: Optional[str] = None):
+    def __call__(
+        self,
+        name: Optional[str] = None,
+        cache_key: Optional[CacheKeyType] = None,
+        cache_ttl: Optional[float] = None,
+        cache_size: int = 1024,
+        executor: Optional[str] = None,
+    ):
         def wrapper(handler: CallbackType):
-            self.add(handler, name)
-            return handler
+            return self.add(handler, name, cache_key, cache_ttl, cache_size, executor)
 
         return wrapper
 
+    def invalidate(self, handler: Union[str, CallbackType], *args: Any, **kwargs: Any):
+        """
+        Drops cached results of handler
+
+        Arguments are passed to cache key function to drop only one result,
+        if no arguments passed all results of handler are dropped.
+        """
+        registered = self.get(self.get_handler_name(handler))
+        cache = getattr(registered, "__render_cache__", None)
+        if cache is None:
+            raise ValueError(f"Handler {handler} is not cached")
+        cache.invalidate(*args, **kwargs)
+
     def get_handler_name(self, handler: Union[str, CallbackType]) -> str:
         name = None
         if isinstance(handler, str) and handler in self._handlers:
             name = handler
-        for i in self._handlers:
-            if self._handlers[i] == handler:
+        for i, registered in self._handlers.items():
+            if handler in (registered, getattr(registered, "__wrapped__", None)):
                 name = i
                 break
 
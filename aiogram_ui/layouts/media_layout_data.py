@@ -0,0 +1,180 @@
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Type, Union
+
+from aiogram import Bot
+from aiogram.methods import (
+    EditMessageMedia,
+    SendAnimation,
+    SendDocument,
+    SendMediaGroup,
+    SendPhoto,
+    TelegramMethod,
+)
+from aiogram.types import (
+    CallbackQuery,
+    InlineKeyboardMarkup,
+    InputFile,
+    InputMedia,
+    InputMediaAnimation,
+    InputMediaDocument,
+    InputMediaPhoto,
+    Message,
+)
+from pydantic import BaseModel, ConfigDict
+
+from .file_id_storage import FileIdStorage, MemoryFileIdStorage, file_key
+from .tools import has_media
+
+
+def _get_chat_id(event: Union[Message, CallbackQuery]) -> Union[int, str]:
+    chat_id = None
+    if isinstance(event, Message):
+        chat_id = event.chat.id
+    elif isinstance(event, CallbackQuery) and event.message and event.message.chat.id:
+        chat_id = event.message.chat.id
+    assert chat_id is not None, "chat_id cant be fetched from event"
+    return chat_id
+
+
+class MediaLayoutData(BaseModel):
+    """
+    Base class of single media layouts
+
+    :code:`media` can be file_id, url or InputFile. InputFile is uploaded once per bot,
+    then its file_id is taken from :code:`file_id_storage` by content hash.
+    """
+
+    model_config = ConfigDict(extra="allow", arbitrary_types_allowed=True)
+
+    file_id_storage: ClassVar[FileIdStorage] = MemoryFileIdStorage()
+    __media_field__: ClassVar[str]
+    __send_method__: ClassVar[Type[TelegramMethod[Message]]]
+    __input_media__: ClassVar[Type[InputMedia]]
+
+    media: Union[str, InputFile]
+    caption: Optional[str] = None
+    reply_markup: Optional[InlineKeyboardMarkup] = None
+
+    async def _resolve_media(self, bot: Bot) -> Tuple[Union[str, InputFile], Optional[str]]:
+        if not isinstance(self.media, InputFile):
+            return self.media, None
+
+        key = await file_key(self.media)
+        if key is None:
+            return self.media, None
+
+        file_id = await self.file_id_storage.get(bot.id, key)
+        if file_id is not None:
+            return file_id, None
+        return self.media, key
+
+    async def _remember(self, bot: Bot, key: Optional[str], message: Any) -> None:
+        if key is None or not isinstance(message, Message):
+            return
+        media = getattr(message, self.__media_field__, None)
+        if isinstance(media, list):
+            # Photo sizes, the biggest one is the last
+            media = media[-1] if media else None
+        if media is not None:
+            await self.file_id_storage.set(bot.id, key, media.file_id)
+
+    def _dump(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.model_dump(exclude={"media"}) | kwargs
+
+    async def input_media(self, bot: Bot) -> Tuple[InputMedia, Optional[str]]:
+        """
+        Returns InputMedia for EditMessageMedia or SendMediaGroup and content key
+        of file to remember if it will be uploaded
+        """
+        media, key = await self._resolve_media(bot)
+        kw = self._dump()
+        kw = {k: v for k, v in kw.items() if k in self.__input_media__.model_fields}
+        return self.__input_media__(media=media, **kw), key
+
+    async def set(
+        self, event: Union[Message, CallbackQuery], **kwargs: Any
+    ) -> Union[Message, bool]:
+        assert event.bot is not None, "event.bot must be set before using this layout"
+        bot = event.bot
+        message = event if isinstance(event, Message) else event.message
+        if (
+            isinstance(message, Message)
+            and message.from_user
+            and message.from_user.id == bot.id
+            and has_media(message)
+        ):
+            input_media, key = await self.input_media(bot)
+            result = await EditMessageMedia(
+                chat_id=message.chat.id,
+                message_id=message.message_id,
+                media=input_media,
+                reply_markup=kwargs.get("reply_markup", self.reply_markup),
+            ).as_(bot)
+            await self._remember(bot, key, result)
+            return result
+
+        return await self.send(event, **kwargs)
+
+    async def send(self, event: Union[Message, CallbackQuery], **kwargs: Any) -> Message:
+        assert event.bot is not None, "event.bot must be set before using this layout"
+        return await self.send_to(_get_chat_id(event), event.bot, **kwargs)
+
+    async def send_to(self, chat_id: Union[int, str], bot: Bot, **kwargs: Any) -> Message:
+        media, key = await self._resolve_media(bot)
+        kw = self._dump(**kwargs) | {"chat_id": chat_id, self.__media_field__: media}
+        message = await self.__send_method__(**kw).as_(bot)
+        await self._remember(bot, key, message)
+        return message
+
+
+class PhotoLayoutData(MediaLayoutData):
+    __media_field__ = "photo"
+    __send_method__ = SendPhoto
+    __input_media__ = InputMediaPhoto
+
+
+class DocumentLayoutData(MediaLayoutData):
+    __media_field__ = "document"
+    __send_method__ = SendDocument
+    __input_media__ = InputMediaDocument
+
+
+class AnimationLayoutData(MediaLayoutData):
+    __media_field__ = "animation"
+    __send_method__ = SendAnimation
+    __input_media__ = InputMediaAnimation
+
+
+class MediaGroupLayoutData(BaseModel):
+    """
+    Album of photos or documents
+
+    Media groups can not be edited and have no keyboard,
+    so :code:`set` always sends a new album.
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    media: List[Union[PhotoLayoutData, DocumentLayoutData]]
+
+    async def set(
+        self, event: Union[Message, CallbackQuery], **kwargs: Any
+    ) -> List[Message]:
+        return await self.send(event, **kwargs)
+
+    async def send(
+        self, event: Union[Message, CallbackQuery], **kwargs: Any
+    ) -> List[Message]:
+        assert event.bot is not None, "event.bot must be set before using this layout"
+        return await self.send_to(_get_chat_id(event), event.bot, **kwargs)
+
+    async def send_to(
+        self, chat_id: Union[int, str], bot: Bot, **kwargs: Any
+    ) -> List[Message]:
+        items = [await i.input_media(bot) for i in self.media]
+        kw = self.model_dump(exclude={"media"}) | kwargs
+        messages = await SendMediaGroup(
+            chat_id=chat_id, media=[i for i, _ in items], **kw
+        ).as_(bot)
+        for layout, (_, key), message in zip(self.media, items, messages):
+            await layout._remember(bot, key, message)
+        return messages
@@ -1,20 +1,34 @@
-from typing import Any, Awaitable, Callable, Dict, Optional, Union, cast
+import functools
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional, Union, cast
 
 from aiogram import BaseMiddleware
 from aiogram.dispatcher.event.handler import HandlerObject
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 
-from .context import LayoutContext
+from .context import LAYOUT_DATA_TYPES, LayoutContext
+from .executor import LayoutExecutor
 from .fsm_context import LayoutFSMContext
 from .handler_dispatcher import LayoutDP
-from .text_layout_data import TextLayoutData
 from .tools import wrap_middleware
 
+if TYPE_CHECKING:
+    from .scheduler import LayoutScheduler
+
 
 class LayoutMiddleware(BaseMiddleware):
-    def __init__(self, layout_handler_dispatcher: Optional[LayoutDP] = None):
+    def __init__(
+        self,
+        layout_handler_dispatcher: Optional[LayoutDP] = None,
+        layout_scheduler: Optional["LayoutScheduler"] = None,
+        layout_executor: Optional[LayoutExecutor] = None,
+    ):
         self.layout_dp = layout_handler_dispatcher or LayoutDP()
+        self.layout_scheduler = layout_scheduler
+        if layout_executor is None and layout_scheduler is not None:
+            # Timers and updates share one pool
+            layout_executor = layout_scheduler.layout_executor
+        self.layout_executor = layout_executor or LayoutExecutor()
 
     async def __call__(
         self,
@@ -35,19 +49,27 @@ class LayoutMiddleware(BaseMiddleware):
         layout_context = cast(LayoutContext, data["layout_context"])
         state = data.get("state")
         if isinstance(state, FSMContext) and state is not None:
-            state = LayoutFSMContext(state.storage, state.key, self.layout_dp)
+            state = LayoutFSMContext(
+                state.storage, state.key, self.layout_dp, self.layout_scheduler
+            )
             data["state"] = state
 
+        if self.layout_scheduler is not None:
+            data["layout_scheduler"] = self.layout_scheduler
+
         result = await handler(event, data)
 
-        if isinstance(result, TextLayoutData):
+        if isinstance(result, LAYOUT_DATA_TYPES):
             return await layout_context.set(result)
 
         if isinstance(result, Callable):
-            wrapped_inner = wrap_middleware(
-                self,
-                HandlerObject(result).call,
-            )
+            handler_object = HandlerObject(result)
+            call = handler_object.call
+            mode = self.layout_dp.get_executor_mode(result)
+            if mode is not None:
+                call = functools.partial(self.layout_executor.call, mode, handler_object)
+
+            wrapped_inner = wrap_middleware(self, call)
             result = await wrapped_inner(event, data | {"is_original": False})
 
         return result
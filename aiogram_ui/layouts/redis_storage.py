@@ -0,0 +1,41 @@
+from typing import Any, Dict, Mapping, Optional
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+
+from .serializer import LayoutDataSerializer
+
+
+class LayoutRedisStorage(RedisStorage):
+    """
+    Redis storage that keeps FSM data in :code:`LayoutDataSerializer` format
+
+    Requires :code:`redis` package.
+
+    :code:`RedisStorage` decodes stored values as utf-8 before passing them to
+    :code:`json_loads`, so binary payloads are read and written here directly.
+    """
+
+    def __init__(
+        self, *args: Any, serializer: Optional[LayoutDataSerializer] = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.serializer = serializer or LayoutDataSerializer()
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        redis_key = self.key_builder.build(key, "data")
+        if not data:
+            await self.redis.delete(redis_key)
+            return
+        await self.redis.set(
+            redis_key,
+            self.serializer.dumps(dict(data)),
+            ex=self.data_ttl,
+        )
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        redis_key = self.key_builder.build(key, "data")
+        value = await self.redis.get(redis_key)
+        if value is None:
+            return {}
+        return self.serializer.loads(value)
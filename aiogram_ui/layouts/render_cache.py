@@ -0,0 +1,116 @@
+import asyncio
+import functools
+import inspect
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from aiogram.dispatcher.event.handler import CallbackType
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from cachetools import TTLCache
+
+from .text_layout_data import TextLayoutData
+
+CacheKeyType = Callable[..., Hashable]
+Rows = Tuple[Tuple[InlineKeyboardButton, ...], ...]
+
+
+def _consume_exception(task: "asyncio.Task[Any]") -> None:
+    # Callers get the exception, the task itself should not log it
+    if not task.cancelled():
+        task.exception()
+
+
+class RenderCache:
+    """
+    Cache of TextLayoutData produced by one layout handler
+
+    Results are stored by :code:`key(*args, **kwargs)` (called with the same arguments
+    as handler) for :code:`ttl` seconds. Concurrent misses with the same key
+    wait for a single render. Keyboard rows are kept as tuples and every caller gets
+    its own layout and keyboard lists, so adding or removing buttons does not change
+    the cached result (buttons themselves are shared).
+    Results other than TextLayoutData are not cached, renders that were running
+    when the key was invalidated are not cached too.
+    """
+
+    def __init__(
+        self,
+        key: Optional[CacheKeyType] = None,
+        ttl: float = 60,
+        maxsize: int = 1024,
+    ):
+        self.key = key
+        self._cache: TTLCache[
+            Hashable, Tuple[TextLayoutData, Optional[Rows]]
+        ] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._pending: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    def invalidate(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Drops cached result for the key made from arguments or all results if no arguments passed
+        """
+        # Running renders of the key are detached, their results will not be cached
+        if not args and not kwargs:
+            self._cache.clear()
+            self._pending.clear()
+            return
+        key = self.key(*args, **kwargs) if self.key else None
+        self._cache.pop(key, None)
+        self._pending.pop(key, None)
+
+    @staticmethod
+    def _freeze(layout: TextLayoutData) -> Tuple[TextLayoutData, Optional[Rows]]:
+        markup = layout.reply_markup
+        if markup is None:
+            return layout.model_copy(), None
+        return layout.model_copy(), tuple(tuple(i) for i in markup.inline_keyboard)
+
+    @staticmethod
+    def _thaw(layout: TextLayoutData, rows: Optional[Rows]) -> TextLayoutData:
+        markup: Optional[InlineKeyboardMarkup] = layout.reply_markup
+        if markup is not None and rows is not None:
+            markup = markup.model_copy(
+                update={"inline_keyboard": [list(i) for i in rows]}
+            )
+        return layout.model_copy(update={"reply_markup": markup})
+
+    def wrap(self, handler: CallbackType) -> CallbackType:
+        is_async = inspect.iscoroutinefunction(handler)
+
+        async def render(key: Hashable, args: Any, kwargs: Any) -> Any:
+            task = asyncio.current_task()
+            try:
+                if is_async:
+                    result = await handler(*args, **kwargs)
+                else:
+                    result = await asyncio.to_thread(handler, *args, **kwargs)
+            finally:
+                # Key was invalidated while rendering if the task is not pending anymore
+                is_actual = self._pending.get(key) is task
+                if is_actual:
+                    del self._pending[key]
+
+            if is_actual and isinstance(result, TextLayoutData):
+                self._cache[key] = self._freeze(result)
+            return result
+
+        @functools.wraps(handler)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = self.key(*args, **kwargs) if self.key else None
+            cached = self._cache.get(key)
+            if cached is not None:
+                return self._thaw(*cached)
+
+            task = self._pending.get(key)
+            if task is None:
+                task = asyncio.create_task(render(key, args, kwargs))
+                task.add_done_callback(_consume_exception)
+                self._pending[key] = task
+
+            # Render is shared by concurrent misses, cancelled caller does not cancel it
+            result = await asyncio.shield(task)
+            if isinstance(result, TextLayoutData):
+                return self._thaw(*self._freeze(result))
+            return result
+
+        wrapper.__render_cache__ = self  # type: ignore[attr-defined]
+        return wrapper
@@ -0,0 +1,361 @@
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Union
+from uuid import uuid4
+
+from aiogram import Bot
+from aiogram.dispatcher.event.handler import CallbackType, HandlerObject
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+from pydantic import BaseModel
+
+from .context import LAYOUT_DATA_TYPES
+from .executor import LayoutExecutor
+from .fsm_context import TIMER_NEXT_CALLBACK, LayoutFSMContext
+from .handler_dispatcher import LayoutDP
+
+logger = logging.getLogger(__name__)
+
+DESTINY = "layout_scheduler"
+
+
+class Timer(BaseModel):
+    id: str
+    deadline: float
+    kind: str
+    handler: Optional[str] = None
+    chat_id: int
+    user_id: int
+    thread_id: Optional[int] = None
+    data: Dict[str, Any] = {}
+
+
+class LayoutScheduler:
+    """
+    Hashed timing wheel for delayed layouts and expiring next callbacks
+
+    Timers are put in one of :code:`slots` buckets by their deadline tick, so scheduling
+    and cancelling are O(1) and every :code:`tick` seconds only one bucket is checked.
+    Due timers are fired in batches of :code:`batch_size`.
+
+    Timers are persisted to :code:`storage` as a journal under the
+    :code:`"layout_scheduler"` destiny: once per tick only timers added and removed
+    since the previous tick are written as one record. Records without pending timers
+    are deleted, and the journal is compacted into a single record on :code:`start`
+    or when it grows over :code:`max_records`. Pending timers are loaded back on
+    :code:`start` and overdue ones are fired right away.
+    With RedisStorage, its key builder must be created with :code:`with_destiny=True`.
+
+    When timer fires, its handler is called with :code:`bot`, :code:`state`,
+    :code:`chat_id`, :code:`user_id`, :code:`layout_scheduler` and timer data as keyword arguments
+    (only ones in handler signature are passed). Returned layout data is sent to the chat.
+    Handlers added with :code:`executor` are run by :code:`layout_executor`.
+
+    Only one scheduler per bot should run, otherwise timers are fired several times.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        storage: BaseStorage,
+        layout_handler_dispatcher: LayoutDP,
+        tick: float = 1.0,
+        slots: int = 512,
+        batch_size: int = 100,
+        max_records: int = 1024,
+        layout_executor: Optional[LayoutExecutor] = None,
+    ):
+        self.bot = bot
+        self.storage = storage
+        self.layout_dp = layout_handler_dispatcher
+        self.tick = tick
+        self.slots = slots
+        self.batch_size = batch_size
+        self._wheel: List[Dict[str, Timer]] = [{} for _ in range(slots)]
+        self.max_records = max_records
+        self.layout_executor = layout_executor or LayoutExecutor()
+        # Journal: timers and removals not written yet, record of every persisted timer,
+        # amount of pending timers in record and records it removes timers from
+        self._added: Dict[str, Timer] = {}
+        self._removed: Dict[str, int] = {}
+        self._timer_records: Dict[str, int] = {}
+        self._records: Dict[int, int] = {}
+        self._record_refs: Dict[int, Set[int]] = {}
+        self._seq = 0
+        self._need_compact = False
+        self._current_tick = self._tick_of(time.time())
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stopping = asyncio.Event()
+
+    def __len__(self) -> int:
+        return sum(len(i) for i in self._wheel)
+
+    def _tick_of(self, timestamp: float) -> int:
+        return int(timestamp // self.tick)
+
+    def _record_key(self, seq: int) -> StorageKey:
+        # Record 0 is the index of the journal
+        return StorageKey(bot_id=self.bot.id, chat_id=0, user_id=seq, destiny=DESTINY)
+
+    def _slot_of(self, timer_id: str) -> int:
+        return int(timer_id.split(":", 1)[0]) % self.slots
+
+    def schedule(
+        self,
+        delay: float,
+        kind: str,
+        chat_id: int,
+        user_id: int,
+        handler: Optional[Union[str, CallbackType]] = None,
+        thread_id: Optional[int] = None,
+        **data: Any,
+    ) -> str:
+        """
+        Adds timer and returns its id
+
+        :param delay: seconds before firing
+        :param kind: :code:`TIMER_LAYOUT` to call handler and send its layout or
+            :code:`TIMER_NEXT_CALLBACK` to expire next callback of user and then call handler
+        :param handler: LayoutDP handler or its name
+        :param data: JSON serializable data passed to handler as keyword arguments
+        """
+        deadline = time.time() + delay
+        deadline_tick = max(self._tick_of(deadline), self._current_tick + 1)
+        timer = Timer(
+            id=f"{deadline_tick}:{uuid4().hex[:12]}",
+            deadline=deadline,
+            kind=kind,
+            handler=self.layout_dp.get_handler_name(handler) if handler else None,
+            chat_id=chat_id,
+            user_id=user_id,
+            thread_id=thread_id,
+            data=data,
+        )
+        self._wheel[deadline_tick % self.slots][timer.id] = timer
+        self._added[timer.id] = timer
+        return timer.id
+
+    def cancel(self, timer_id: str) -> bool:
+        """
+        Removes timer, returns False if it has already fired or does not exist
+        """
+        if self._wheel[self._slot_of(timer_id)].pop(timer_id, None) is None:
+            return False
+        self._forget(timer_id)
+        return True
+
+    def state_for(self, timer: Timer) -> LayoutFSMContext:
+        key = StorageKey(
+            bot_id=self.bot.id,
+            chat_id=timer.chat_id,
+            user_id=timer.user_id,
+            thread_id=timer.thread_id,
+        )
+        return LayoutFSMContext(self.storage, key, self.layout_dp, self)
+
+    async def _fire(self, timer: Timer) -> None:
+        state = self.state_for(timer)
+        if timer.kind == TIMER_NEXT_CALLBACK:
+            layout_data = await state.get_layout_data()
+            if layout_data.get("next_callback_timer") != timer.id:
+                return
+            layout_data.pop("next_callback", None)
+            layout_data.pop("next_callback_timer", None)
+            await state.set_layout_data(layout_data)
+
+        if timer.handler is None:
+            return
+
+        handler = self.layout_dp.get(timer.handler)
+        handler_object = HandlerObject(handler)
+        call = handler_object.call
+        mode = self.layout_dp.get_executor_mode(handler)
+        if mode is not None:
+            call = functools.partial(self.layout_executor.call, mode, handler_object)
+        result = await call(
+            **timer.data,
+            bot=self.bot,
+            state=state,
+            chat_id=timer.chat_id,
+            user_id=timer.user_id,
+            layout_scheduler=self,
+        )
+        if isinstance(result, LAYOUT_DATA_TYPES):
+            await result.send_to(timer.chat_id, self.bot)
+
+    async def _fire_batch(self, timers: List[Timer]) -> None:
+        for i in range(0, len(timers), self.batch_size):
+            batch = timers[i : i + self.batch_size]
+            results = await asyncio.gather(
+                *(self._fire(t) for t in batch), return_exceptions=True
+            )
+            for timer, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    logger.exception(
+                        "Timer %s (%s) failed", timer.id, timer.handler, exc_info=result
+                    )
+
+    def _pop_due(self, slot: int, tick: int) -> List[Timer]:
+        bucket = self._wheel[slot]
+        due = [t for t in bucket.values() if int(t.id.split(":", 1)[0]) <= tick]
+        for timer in due:
+            del bucket[timer.id]
+            self._forget(timer.id)
+        return due
+
+    def _forget(self, timer_id: str) -> None:
+        if self._added.pop(timer_id, None) is not None:
+            return
+        seq = self._timer_records.pop(timer_id, None)
+        if seq is not None:
+            self._records[seq] -= 1
+            self._removed[timer_id] = seq
+
+    @property
+    def _dirty(self) -> bool:
+        return bool(self._added or self._removed or self._need_compact)
+
+    def _drop_records(self) -> List[int]:
+        # Record is needed while it has pending timers or removes timers of needed record
+        dropped = []
+        changed = True
+        while changed:
+            changed = False
+            for seq in list(self._records):
+                if self._records[seq] or self._record_refs[seq] & self._records.keys():
+                    continue
+                del self._records[seq]
+                del self._record_refs[seq]
+                dropped.append(seq)
+                changed = True
+        return dropped
+
+    async def _write_index(self, dropped: List[int]) -> None:
+        await self.storage.set_data(
+            key=self._record_key(0),
+            data={"seq": self._seq, "records": sorted(self._records)},
+        )
+        for seq in dropped:
+            await self.storage.set_data(key=self._record_key(seq), data={})
+
+    async def _flush(self) -> None:
+        if self._need_compact or len(self._records) >= self.max_records:
+            await self._compact()
+            return
+        if not self._added and not self._removed:
+            return
+
+        added, self._added = self._added, {}
+        removed, self._removed = self._removed, {}
+        self._seq += 1
+        seq = self._seq
+        # Bookkeeping goes first, timers may be cancelled while record is written
+        for timer_id in added:
+            self._timer_records[timer_id] = seq
+        self._records[seq] = len(added)
+        self._record_refs[seq] = set(removed.values())
+        try:
+            await self.storage.set_data(
+                key=self._record_key(seq),
+                data={
+                    "add": {i: t.model_dump() for i, t in added.items()},
+                    "remove": list(removed),
+                },
+            )
+            await self._write_index(self._drop_records())
+        except BaseException:
+            # Also on cancellation: the journal may be inconsistent now, rewrite it from scratch
+            self._need_compact = True
+            raise
+
+    async def _compact(self) -> None:
+        """Writes all pending timers as one record and deletes other records"""
+        self._need_compact = True
+        self._seq += 1
+        seq = self._seq
+        timers = {i: t for bucket in self._wheel for i, t in bucket.items()}
+        dropped = list(self._records)
+        self._added.clear()
+        self._removed.clear()
+        self._timer_records = dict.fromkeys(timers, seq)
+        self._records = {seq: len(timers)}
+        self._record_refs = {seq: set()}
+        await self.storage.set_data(
+            key=self._record_key(seq),
+            data={"add": {i: t.model_dump() for i, t in timers.items()}, "remove": []},
+        )
+        await self._write_index(dropped)
+        self._need_compact = False
+
+    async def _load(self) -> None:
+        index = await self.storage.get_data(key=self._record_key(0))
+        self._seq = index.get("seq", 0)
+        timers: Dict[str, Any] = {}
+        for seq in index.get("records", []):
+            record = await self.storage.get_data(key=self._record_key(seq))
+            timers.update(record.get("add", {}))
+            for timer_id in record.get("remove", []):
+                timers.pop(timer_id, None)
+            # Loaded records are replaced by compaction
+            self._records[seq] = 0
+            self._record_refs[seq] = set()
+
+        for timer_id, timer in timers.items():
+            self._wheel[self._slot_of(timer_id)][timer_id] = Timer.model_validate(timer)
+        self._need_compact = True
+
+    async def _run(self) -> None:
+        while True:
+            next_tick = self._current_tick + 1
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), max(0.0, next_tick * self.tick - time.time())
+                )
+                return
+            except asyncio.TimeoutError:
+                pass
+
+            due: List[Timer] = []
+            # Catch up if the loop was late for several ticks
+            now_tick = self._tick_of(time.time())
+            for tick in range(next_tick, max(now_tick, next_tick) + 1):
+                due += self._pop_due(tick % self.slots, tick)
+                self._current_tick = tick
+
+            if due:
+                await self._fire_batch(due)
+            if self._dirty:
+                try:
+                    await self._flush()
+                except Exception:
+                    logger.exception("Failed to persist timers")
+
+    async def start(self) -> None:
+        """Loads persisted timers and starts the wheel"""
+        if self._task is not None:
+            return
+        self._current_tick = self._tick_of(time.time())
+        await self._load()
+        await self._compact()
+        overdue: List[Timer] = []
+        for slot in range(self.slots):
+            overdue += self._pop_due(slot, self._current_tick)
+        if overdue:
+            await self._fire_batch(overdue)
+        await self._flush()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the wheel and persists pending timers
+
+        Timers of the current tick are fired before the wheel stops, cancelling them
+        in the middle would lose them: they are already removed from the journal.
+        """
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self._flush()
@@ -0,0 +1,275 @@
+import json
+import struct
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .fsm_context import LayoutFSMContext
+
+if TYPE_CHECKING:
+    from .handler_dispatcher import LayoutDP
+
+MAGIC = 0xA7
+VERSION = 1
+
+FLAG_COMPRESSED = 0x01
+
+_NONE = 0x00
+_FALSE = 0x01
+_TRUE = 0x02
+_INT = 0x03
+_FLOAT = 0x04
+_STR = 0x05
+_LIST = 0x06
+_DICT = 0x07
+_HANDLER = 0x08
+_KEY = 0x09
+_LAYOUT_KEY = 0x0A
+
+_DOUBLE = struct.Struct("<d")
+_UINT32 = struct.Struct("<I")
+
+DEFAULT_KEYS: Tuple[str, ...] = (LayoutFSMContext._prefix + "next_callback",)
+DEFAULT_HANDLER_KEYS: Tuple[str, ...] = (LayoutFSMContext._prefix + "next_callback",)
+
+
+def _handler_id(name: str) -> int:
+    return zlib.crc32(name.encode())
+
+
+class LayoutDataSerializer:
+    """
+    Compact binary serializer for FSM data stored by :code:`LayoutFSMContext`
+
+    Every payload starts with a 3 byte header (magic, format version, flags).
+    Keys listed in the key table are written as a table index, other
+    :code:`__lt_ctx:` keys are written without the prefix, and values of
+    :code:`handler_keys` (:code:`__lt_ctx:next_callback` by default) that are
+    names of handlers registered in :code:`LayoutDP` (also as list items)
+    are written as a 4 byte id.
+    Ids of handlers that are not registered anymore are read as :code:`None`.
+    Non-str keys are converted to str like JSON does.
+    Payloads longer than :code:`compress_threshold` are zlib-compressed.
+
+    Payloads without the header are parsed as JSON, so data written before the
+    serializer was plugged in is still readable.
+
+    Key table is a part of the stored format: only append new keys to it.
+    """
+
+    def __init__(
+        self,
+        layout_handler_dispatcher: Optional["LayoutDP"] = None,
+        keys: Iterable[str] = (),
+        handler_keys: Iterable[str] = (),
+        compress_threshold: Optional[int] = 256,
+        compress_level: int = 6,
+    ):
+        self.layout_dp = layout_handler_dispatcher
+        self.keys: Tuple[str, ...] = DEFAULT_KEYS + tuple(
+            i for i in keys if i not in DEFAULT_KEYS
+        )
+        self._key_ids = {k: i for i, k in enumerate(self.keys)}
+        self.handler_keys = frozenset(DEFAULT_HANDLER_KEYS) | frozenset(handler_keys)
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self._handlers_count = -1
+        self._handler_ids: Dict[str, int] = {}
+        self._handler_names: Dict[int, str] = {}
+
+    def _refresh_handlers(self) -> None:
+        if self.layout_dp is None or len(self.layout_dp) == self._handlers_count:
+            return
+
+        ids: Dict[int, List[str]] = {}
+        for name in self.layout_dp.names():
+            ids.setdefault(_handler_id(name), []).append(name)
+
+        # Colliding names are stored as plain strings
+        self._handler_names = {i: n[0] for i, n in ids.items() if len(n) == 1}
+        self._handler_ids = {n: i for i, n in self._handler_names.items()}
+        self._handlers_count = len(self.layout_dp)
+
+    @staticmethod
+    def _write_uint(out: bytearray, value: int) -> None:
+        while value > 0x7F:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def _write_str(self, out: bytearray, value: str) -> None:
+        raw = value.encode()
+        self._write_uint(out, len(raw))
+        out += raw
+
+    @staticmethod
+    def _coerce_key(key: Any) -> str:
+        # The same way as json.dumps does
+        if isinstance(key, str):
+            return key
+        if key is True:
+            return "true"
+        if key is False:
+            return "false"
+        if key is None:
+            return "null"
+        if isinstance(key, (int, float)):
+            return json.dumps(key)
+        raise TypeError(
+            f"Keys must be str, int, float, bool or None, not {type(key).__name__!r}"
+        )
+
+    def _write_key(self, out: bytearray, key: Any) -> None:
+        key = self._coerce_key(key)
+        if key in self._key_ids:
+            out.append(_KEY)
+            self._write_uint(out, self._key_ids[key])
+        elif key.startswith(LayoutFSMContext._prefix):
+            out.append(_LAYOUT_KEY)
+            self._write_str(out, key[len(LayoutFSMContext._prefix) :])
+        else:
+            out.append(_STR)
+            self._write_str(out, key)
+
+    def _write(self, out: bytearray, value: Any, is_handler: bool = False) -> None:
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            self._write_uint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            if is_handler and value in self._handler_ids:
+                out.append(_HANDLER)
+                out += _UINT32.pack(self._handler_ids[value])
+            else:
+                out.append(_STR)
+                self._write_str(out, value)
+        elif isinstance(value, (list, tuple)):
+            out.append(_LIST)
+            self._write_uint(out, len(value))
+            for item in value:
+                self._write(out, item, is_handler)
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            self._write_uint(out, len(value))
+            for k, v in value.items():
+                self._write_key(out, k)
+                self._write(out, v, is_handler=k in self.handler_keys)
+        else:
+            raise TypeError(
+                f"Object of type {type(value).__name__!r} can not be serialized"
+            )
+
+    @staticmethod
+    def _read_uint(data: bytes, pos: int) -> Tuple[int, int]:
+        result = 0
+        shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, pos
+            shift += 7
+
+    def _read_str(self, data: bytes, pos: int) -> Tuple[str, int]:
+        length, pos = self._read_uint(data, pos)
+        return data[pos : pos + length].decode(), pos + length
+
+    def _read_key(self, data: bytes, pos: int) -> Tuple[str, int]:
+        tag = data[pos]
+        if tag == _KEY:
+            index, pos = self._read_uint(data, pos + 1)
+            return self.keys[index], pos
+        if tag == _LAYOUT_KEY:
+            key, pos = self._read_str(data, pos + 1)
+            return LayoutFSMContext._prefix + key, pos
+        if tag == _STR:
+            return self._read_str(data, pos + 1)
+        raise ValueError(f"Unknown key tag {tag:#x} at {pos}")
+
+    def _read(self, data: bytes, pos: int) -> Tuple[Any, int]:
+        tag = data[pos]
+        pos += 1
+        if tag == _NONE:
+            return None, pos
+        if tag == _FALSE:
+            return False, pos
+        if tag == _TRUE:
+            return True, pos
+        if tag == _INT:
+            value, pos = self._read_uint(data, pos)
+            return (value >> 1) if not value & 1 else -((value + 1) >> 1), pos
+        if tag == _FLOAT:
+            return _DOUBLE.unpack_from(data, pos)[0], pos + _DOUBLE.size
+        if tag == _STR:
+            return self._read_str(data, pos)
+        if tag == _HANDLER:
+            handler_id = _UINT32.unpack_from(data, pos)[0]
+            # Handler was renamed or removed, losing it is better than losing the record
+            return self._handler_names.get(handler_id), pos + _UINT32.size
+        if tag == _LIST:
+            length, pos = self._read_uint(data, pos)
+            result = []
+            for _ in range(length):
+                item, pos = self._read(data, pos)
+                result.append(item)
+            return result, pos
+        if tag == _DICT:
+            length, pos = self._read_uint(data, pos)
+            mapping = {}
+            for _ in range(length):
+                key, pos = self._read_key(data, pos)
+                mapping[key], pos = self._read(data, pos)
+            return mapping, pos
+        raise ValueError(f"Unknown tag {tag:#x} at {pos - 1}")
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        """
+        Serialize FSM data
+
+        :param data: FSM data (state and layout data)
+        :return: bytes with versioned header
+        """
+        self._refresh_handlers()
+        body = bytearray()
+        self._write(body, data)
+
+        flags = 0
+        if self.compress_threshold is not None and len(body) > self.compress_threshold:
+            compressed = zlib.compress(body, self.compress_level)
+            if len(compressed) < len(body):
+                body = bytearray(compressed)
+                flags |= FLAG_COMPRESSED
+
+        return bytes((MAGIC, VERSION, flags)) + body
+
+    def loads(self, raw: Union[bytes, str]) -> Dict[str, Any]:
+        """
+        Deserialize FSM data
+
+        :param raw: value produced by :code:`dumps` or a JSON document
+        :return: FSM data
+        """
+        if isinstance(raw, str):
+            return json.loads(raw)
+        if not raw or raw[0] != MAGIC:
+            return json.loads(raw)
+
+        version, flags = raw[1], raw[2]
+        if version != VERSION:
+            raise ValueError(f"Unsupported layout data version {version}")
+
+        body = raw[3:]
+        if flags & FLAG_COMPRESSED:
+            body = zlib.decompress(body)
+
+        self._refresh_handlers()
+        data, _ = self._read(body, 0)
+        return data
@@ -5,6 +5,8 @@ from aiogram.methods import EditMessageText, SendMessage
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
 from pydantic import BaseModel, ConfigDict
 
+from .tools import has_media
+
 
 class TextLayoutData(BaseModel):
     model_config = ConfigDict(extra="allow")
@@ -22,6 +24,8 @@ class TextLayoutData(BaseModel):
             isinstance(message, Message)
             and message.from_user
             and message.from_user.id == event.bot.id
+            # Media messages have no text to edit, new message is sent instead
+            and not has_media(message)
         ):
             kw = kw | {
                 "chat_id": message.chat.id,
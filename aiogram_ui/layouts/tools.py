@@ -7,7 +7,13 @@ from aiogram.dispatcher.event.bases import (
     NextMiddlewareType,
 )
 from aiogram.dispatcher.event.handler import CallbackType
-from aiogram.types import TelegramObject
+from aiogram.types import Message, TelegramObject
+
+MEDIA_FIELDS = ("photo", "document", "animation", "video", "audio")
+
+
+def has_media(message: Message) -> bool:
+    return any(getattr(message, i, None) for i in MEDIA_FIELDS)
 
 
 def wrap_middleware(
@@ -0,0 +1,8 @@
+from .paginator import OffsetPaginator, Page, PageCD, Paginator
+
+__all__ = (
+    "OffsetPaginator",
+    "Page",
+    "PageCD",
+    "Paginator",
+)
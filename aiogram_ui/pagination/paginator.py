@@ -0,0 +1,284 @@
+import asyncio
+import logging
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from aiogram import F
+from aiogram.filters.callback_data import CallbackQueryFilter
+from aiogram.types import InlineKeyboardButton
+from cachetools import TTLCache
+
+from ..callback import CallbackData
+from ..inline_keyboard import IKM, B, KeyboardBuilder
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PageCD(CallbackData, prefix="pg"):
+    """Callback data of paginator navigation buttons"""
+
+    name: str
+    cursor: str
+
+
+class Page(Generic[T]):
+    """
+    One page of items
+
+    :code:`next_cursor` and :code:`prev_cursor` are :code:`None` if there is no such page.
+    :code:`number` and :code:`total` (pages amount) are optional and only used for counter button.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[T],
+        cursor: str,
+        next_cursor: Optional[str] = None,
+        prev_cursor: Optional[str] = None,
+        number: Optional[int] = None,
+        total: Optional[int] = None,
+    ):
+        self.items = items
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.number = number
+        self.total = total
+
+
+PageFetcher = Callable[..., Awaitable[Page[T]]]
+ButtonFactory = Callable[[T], Optional[InlineKeyboardButton]]
+
+
+class Paginator(Generic[T]):
+    """
+    Keyboard with items of one page and navigation buttons
+
+    Only the requested page is fetched:
+    :code:`fetch(cursor, limit, **kwargs)` should return :code:`Page` for the cursor
+    (:code:`cursor` is :code:`None` for the first page).
+
+    Keyword arguments of :code:`keyboard` and :code:`get_page` are passed to :code:`fetch`
+    and are a part of cache key, so they should be hashable (user id, filters, etc.).
+
+    If :code:`cache_ttl` is set, pages are cached for this amount of seconds and
+    if :code:`prefetch` is also set, the next page is fetched in background.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: PageFetcher[T],
+        button: ButtonFactory[T],
+        page_size: int = 10,
+        cache_ttl: Optional[float] = None,
+        cache_size: int = 1024,
+        prefetch: bool = False,
+        prev_text: str = "«",
+        next_text: str = "»",
+    ):
+        self.name = name
+        self._fetch = fetch
+        self.button = button
+        self.page_size = page_size
+        self.prefetch = prefetch and cache_ttl is not None
+        self.prev_text = prev_text
+        self.next_text = next_text
+        self._cache: Optional[TTLCache[Hashable, Page[T]]] = (
+            TTLCache(maxsize=cache_size, ttl=cache_ttl) if cache_ttl else None
+        )
+        self._pending: Dict[Hashable, "asyncio.Task[Page[T]]"] = {}
+
+    def filter(self) -> CallbackQueryFilter:
+        """
+        Generates a filter for navigation buttons of this paginator
+
+        :return: instance of filter
+        """
+        return PageCD.filter(F.name == self.name)
+
+    def _cache_key(self, cursor: Optional[str], kwargs: dict) -> Tuple[Hashable, ...]:
+        return (cursor, *sorted(kwargs.items()))
+
+    def normalize_cursor(self, cursor: Optional[str]) -> Optional[str]:
+        """
+        Returns the same cursor for all values pointing to the first page
+        (:code:`None` and empty string of callback data), so it is cached once
+        """
+        return cursor or None
+
+    async def _fetch_and_cache(
+        self, key: Hashable, cursor: Optional[str], kwargs: dict
+    ) -> Page[T]:
+        assert self._cache is not None
+        try:
+            page = await self._fetch(cursor, self.page_size, **kwargs)
+            self._cache[key] = page
+            return page
+        finally:
+            del self._pending[key]
+
+    def _start_fetch(
+        self, key: Hashable, cursor: Optional[str], kwargs: dict
+    ) -> "asyncio.Task[Page[T]]":
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_cache(key, cursor, kwargs))
+            self._pending[key] = task
+        return task
+
+    async def _fetch_cached(self, cursor: Optional[str], **kwargs: Any) -> Page[T]:
+        if self._cache is None:
+            return await self._fetch(cursor, self.page_size, **kwargs)
+
+        key = self._cache_key(cursor, kwargs)
+        page = self._cache.get(key)
+        if page is not None:
+            return page
+        # Concurrent misses wait for one fetch, cancelled caller does not cancel it
+        return await asyncio.shield(self._start_fetch(key, cursor, kwargs))
+
+    @staticmethod
+    def _log_prefetch_error(task: "asyncio.Task[Any]") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Failed to prefetch page", exc_info=task.exception())
+
+    def _prefetch(self, cursor: Optional[str], kwargs: dict) -> None:
+        assert self._cache is not None
+        key = self._cache_key(cursor, kwargs)
+        if key in self._cache or key in self._pending:
+            return
+        self._start_fetch(key, cursor, kwargs).add_done_callback(
+            self._log_prefetch_error
+        )
+
+    async def get_page(self, cursor: Optional[str] = None, **kwargs: Any) -> Page[T]:
+        page = await self._fetch_cached(self.normalize_cursor(cursor), **kwargs)
+        if self.prefetch and page.next_cursor is not None:
+            self._prefetch(self.normalize_cursor(page.next_cursor), kwargs)
+        return page
+
+    def invalidate(self) -> None:
+        """Drops all cached pages"""
+        if self._cache is not None:
+            self._cache.clear()
+
+    def navigation(self, page: Page[T]) -> Sequence[Optional[InlineKeyboardButton]]:
+        """
+        Makes navigation row for the page
+        """
+        counter = None
+        if page.number is not None:
+            text = str(page.number)
+            if page.total is not None:
+                text = f"{page.number}/{page.total}"
+            counter = B(text, PageCD(name=self.name, cursor=page.cursor))
+
+        return [
+            B(
+                self.prev_text,
+                PageCD(name=self.name, cursor=page.prev_cursor or ""),
+                show=page.prev_cursor is not None,
+            ),
+            counter,
+            B(
+                self.next_text,
+                PageCD(name=self.name, cursor=page.next_cursor or ""),
+                show=page.next_cursor is not None,
+            ),
+        ]
+
+    def render(self, page: Page[T]) -> KeyboardBuilder:
+        """
+        Makes keyboard builder with item buttons and navigation row of the page,
+        so other buttons can be added before building
+        """
+        builder = KeyboardBuilder().add(*(self.button(i) for i in page.items))
+        if page.prev_cursor is not None or page.next_cursor is not None:
+            builder.append(self.navigation(page))
+        return builder
+
+    async def keyboard(self, cursor: Optional[str] = None, **kwargs: Any) -> IKM:
+        page = await self.get_page(cursor, **kwargs)
+        return self.render(page).build()
+
+
+class OffsetPaginator(Paginator[T]):
+    """
+    Paginator over offset/limit data sources
+
+    :code:`fetch(offset, limit, **kwargs)` should return up to :code:`limit` items
+    starting from :code:`offset`. One extra item is requested to know if there is a next page.
+
+    If :code:`count(**kwargs)` is passed, it is used to show the pages amount.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[..., Awaitable[Sequence[T]]],
+        button: ButtonFactory[T],
+        count: Optional[Callable[..., Awaitable[int]]] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(name, self._fetch_offset, button, **kwargs)
+        self._fetch_items = fetch
+        self._count = count
+
+    @staticmethod
+    def _offset_cursor(offset: int) -> str:
+        # First page is the empty cursor, the same as None after normalization
+        return str(offset) if offset else ""
+
+    @staticmethod
+    def _parse_offset(cursor: Optional[str]) -> int:
+        # Cursor comes from callback data: stale or forged buttons mean the first page
+        try:
+            return max(0, int(cursor)) if cursor else 0
+        except ValueError:
+            return 0
+
+    def normalize_cursor(self, cursor: Optional[str]) -> Optional[str]:
+        offset = self._parse_offset(cursor)
+        return str(offset) if offset else None
+
+    async def _fetch_offset(
+        self, cursor: Optional[str], limit: int, **kwargs: Any
+    ) -> Page[T]:
+        offset = self._parse_offset(cursor)
+        total = None
+        if self._count is not None:
+            items, count = await asyncio.gather(
+                self._fetch_items(offset, limit + 1, **kwargs), self._count(**kwargs)
+            )
+            total = max(1, -(-count // limit))
+        else:
+            items = await self._fetch_items(offset, limit + 1, **kwargs)
+
+        next_cursor = None
+        if len(items) > limit:
+            next_cursor = self._offset_cursor(offset + limit)
+        prev_cursor = None
+        if offset > 0:
+            prev_cursor = self._offset_cursor(max(0, offset - limit))
+
+        return Page(
+            items=items[:limit],
+            cursor=self._offset_cursor(offset),
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+            number=offset // limit + 1,
+            total=total,
+        )
@@ -0,0 +1,85 @@
+"""
+Compare LayoutDataSerializer with JSON on synthetic FSM data
+
+Run from the repository root: :code:`python benchmarks/layout_serializer.py`
+"""
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiogram_ui import LayoutDataSerializer, LayoutDP  # noqa: E402
+
+USERS = 20_000
+
+layout_dp = LayoutDP()
+HANDLERS = [
+    "main_menu_layout",
+    "order_confirmation_layout",
+    "product_details_layout",
+    "profile_settings_layout",
+    "support_ticket_layout",
+]
+for name in HANDLERS:
+    layout_dp.add(lambda: None, name)
+
+
+def make_user_data(rnd: random.Random) -> dict:
+    data = {
+        "__lt_ctx:next_callback": rnd.choice(HANDLERS),
+        "__lt_ctx:page": rnd.randint(0, 50),
+        "__lt_ctx:back_stack": rnd.sample(HANDLERS, 3),
+        "cart": [rnd.randint(1, 100_000) for _ in range(rnd.randint(0, 5))],
+        "locale": rnd.choice(["en", "ru", "de"]),
+    }
+    if rnd.random() < 0.1:
+        data["draft"] = " ".join(rnd.choice(HANDLERS) for _ in range(40))
+    return data
+
+
+def bench(name, dumps, loads, payloads):
+    start = time.perf_counter()
+    encoded = [dumps(i) for i in payloads]
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in encoded:
+        loads(i)
+    decode_time = time.perf_counter() - start
+
+    size = sum(len(i) for i in encoded)
+    print(
+        f"{name:<12}"
+        f"{size / len(payloads):>10.1f} B/user"
+        f"{encode_time / len(payloads) * 1e6:>10.2f} us enc"
+        f"{decode_time / len(payloads) * 1e6:>10.2f} us dec"
+    )
+
+
+def main():
+    rnd = random.Random(0)
+    payloads = [make_user_data(rnd) for _ in range(USERS)]
+    serializer = LayoutDataSerializer(
+        layout_dp,
+        keys=["__lt_ctx:page", "cart"],
+        handler_keys=["__lt_ctx:back_stack"],
+    )
+
+    for i in payloads:
+        assert serializer.loads(serializer.dumps(i)) == i
+
+    bench(
+        "json",
+        lambda i: json.dumps(i).encode(),
+        json.loads,
+        payloads,
+    )
+    bench("serializer", serializer.dumps, serializer.loads, payloads)
+
+
+if __name__ == "__main__":
+    main()